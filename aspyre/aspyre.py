@@ -1,26 +1,61 @@
+import asyncio
+import functools
 import sys
+from copy import copy
 from itertools import product
-from collections import OrderedDict
 from urllib.parse import parse_qs
-from asyncio import coroutine
 
-import error
+from . import dictionary
+from . import error
 
 Methods = {
-    'http_methods': ['get', 'post', 'put', 'patch', 'delete'],
-    'before_after': ['before', 'after'],
+    'http_methods': frozenset(('get', 'post', 'put', 'patch', 'delete')),
+    'before_after': frozenset(('before', 'after')),
 }
 
 Methods['callable'] = Methods['http_methods'] \
-                      + Methods['before_after'] \
-                      + list(map(lambda x: x[0] + '_' + x[1],
-                          product(Methods['before_after'], Methods['http_methods'])
-                      ))
+                      | Methods['before_after'] \
+                      | frozenset(map('_'.join, product(Methods['before_after'], Methods['http_methods'])))
+
+HTTP_METHODS = Methods['http_methods']
+
+# All handler attribute names for each HTTP method, in the order their groups are run, so they aren't rebuilt on
+# every request.
+DISPATCH_NAMES = {
+    method: ('before', 'before_' + method, method, 'after_' + method, 'after') for method in HTTP_METHODS
+}
+
+# Indexes of the handler groups returned by Aspyre.find (before and after) whose handlers may run concurrently.
+UNORDERED_GROUPS = frozenset((0, 4))
+
+# Query strings longer than this are parsed every time, rather than being allowed to fill the cache.
+MAX_CACHED_QUERY_STRING = 4096
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_qs_cached(query_string):
+    # Immutable, so that the cached result can't be modified through a previous request's arguments.
+    return tuple((key, tuple(values)) for key, values in parse_qs(query_string).items())
+
+
+def _parse_query_string(query_string):
+    """Parses a query string like ``urllib.parse.parse_qs``, reusing the result for recently seen query strings.
+    """
+    if len(query_string) > MAX_CACHED_QUERY_STRING:
+        return parse_qs(query_string)
+
+    return {key: list(values) for key, values in _parse_qs_cached(query_string)}
+
+
+async def _call_handler(handler, *args, **kwargs):
+    # Calls the handler within a coroutine, so that errors raised by the call itself (e.g. an unexpected URL
+    # argument, or a handler that returns something that can't be awaited) are raised when it is awaited.
+    return await handler(*args, **kwargs)
 
 
 class Find:
     @staticmethod
-    async def first(host, path, method, instances):
+    def first(host, path, method, instances):
         for instance in instances:
             handlers = instance.find(host, path, method)
             if handlers:
@@ -29,18 +64,20 @@ class Find:
         return None
 
     @staticmethod
-    async def best(host, path, method, instances):
-        maximum = -1
-        max_handlers = []
-        found_instance = None
+    def best(host, path, method, instances):
+        maximum = 0
+        best_match = None
         for instance in instances:
             handlers = instance.find(host, path, method)
-            if len(handlers) > maximum:
-                maximum = len(handlers)
-                max_handlers = handlers
-                found_instance = instance
+            if not handlers:
+                continue
+
+            count = sum(map(len, handlers))
+            if count > maximum:
+                maximum = count
+                best_match = handlers, instance
 
-        return max_handlers
+        return best_match
 
 
 class Aspyre:
@@ -53,97 +90,163 @@ class Aspyre:
 
         self.url_class = url_class
         self.codec = codec
+        self.dict_class = dict_class if dict_class else dictionary.AspyreDict
         self.instances = instances
 
+        # Copied for each request's context, which is cheaper than instantiating dict_class.
+        self._blank_dict = self.dict_class()
+
+        # (handler, method) -> the handler's five group callables, see _build_dispatch.
+        self._dispatch_cache = {}
+
+    def register_handler_class(self, cls):
+        """Looks up the callables of a handler class for every HTTP method up front.
+
+        Optional: classes that haven't been registered are looked up on the first request that reaches them.
+
+        Args:
+            cls: A handler class (or object) that is routed to by this object's URL class.
+        """
+        for method in HTTP_METHODS:
+            self._dispatch_cache[(cls, method)] = self._build_dispatch(cls, method)
+
     async def __call__(self, host, path, method, input, headers=None, query_string=None):
-        if method not in Methods['http_methods']:
+        if method not in HTTP_METHODS:
             raise error.NotImplemented(message="The server does not support this HTTP method.")
 
         handlers = self.find(host, path, method)
         if handlers:
-            return self.handle(handlers, input, query_string)
+            return await self.handle(handlers, input, headers, query_string)
         else:
             raise error.NotFound(message='No matching handler for URL found.')
 
-    async def find(self, host, path, method):
+    def find(self, host, path, method):
         found_handlers = self.url_class.find(host, path)
 
         if found_handlers:
-            before = 'before_' + method
-            after = 'after_' + method
-
-            handlers = OrderedDict()
-            handlers['before'] = []
-            handlers[before] = []
-            handlers[method] = []
-            handlers[after] = []
-            handlers['after'] = []
+            # Handler groups, in the order they are run: before, before_<method>, <method>, after_<method>, after.
+            before_handlers = []
+            before_method_handlers = []
+            method_handlers = []
+            after_method_handlers = []
+            after_handlers = []
 
             for handler in found_handlers:
                 arguments = handler[1]
                 handler = handler[0]
 
-                if callable(getattr(handler, 'before', None)):
-                    handlers['before'].append((handler.before, arguments))
-                if callable(getattr(handler, before, None)):
-                    handlers[before].append((getattr(handler, before), arguments))
-                if callable(getattr(handler, method, None)):
-                    handlers[method].append((getattr(handler, method), arguments))
-                if callable(getattr(handler, after, None)):
-                    handlers[after].insert(0, (getattr(handler, method), arguments))
-                if callable(getattr(handler, 'after', None)):
-                    handlers['after'].insert(0, (handler.after, arguments))
-
-            return handlers
+                key = (handler, method)
+                dispatch = self._dispatch_cache.get(key)
+                if dispatch is None:
+                    dispatch = self._dispatch_cache[key] = self._build_dispatch(handler, method)
+                if not dispatch:
+                    continue  # The handler has nothing to run for this method.
+
+                before_fn, before_method_fn, method_fn, after_method_fn, after_fn = dispatch
+                if before_fn is not None:
+                    before_handlers.append((before_fn, arguments))
+                if before_method_fn is not None:
+                    before_method_handlers.append((before_method_fn, arguments))
+                if method_fn is not None:
+                    method_handlers.append((method_fn, arguments))
+                if after_method_fn is not None:
+                    after_method_handlers.append((after_method_fn, arguments))
+                if after_fn is not None:
+                    after_handlers.append((after_fn, arguments))
+
+            # After handlers run in the reverse order to which they were found.
+            after_method_handlers.reverse()
+            after_handlers.reverse()
+
+            return before_handlers, before_method_handlers, method_handlers, after_method_handlers, after_handlers
 
         return None
 
+    @staticmethod
+    def _build_dispatch(handler, method):
+        """Looks up the callables ``handler`` provides for ``method``.
+
+        Returns a tuple of five callables (or None where the handler has no such callable), in group order:
+        before, before_<method>, <method>, after_<method>, after. If the handler has none of them, an empty
+        tuple is returned instead.
+        """
+        result = tuple(
+            fn if callable(fn) else None
+            for fn in (getattr(handler, name, None) for name in DISPATCH_NAMES[method])
+        )
+
+        return result if any(result) else ()
+
     async def handle(self, handlers, input, headers, query_string):
         if not handlers:
             raise error.NotFound(message="No matching handler for URL found.")
 
-        context = self.dict_class()
-        context['arguments'] = parse_qs(query_string) if query_string else None
+        context = copy(self._blank_dict)
+        context['arguments'] = _parse_query_string(query_string) if query_string else None
         context['headers'] = headers
 
         response = self.codec.get_class()
-        in_headers = self.dict_class()
+        in_headers = dictionary.AspyreHeaders()
+
+        for index, group in enumerate(handlers):
+            if index in UNORDERED_GROUPS and len(group) > 1:
+                # The before and after handlers don't depend on each other, so they are awaited concurrently.
+                results = await asyncio.gather(
+                    *(_call_handler(handler, context, in_headers, input, response, **arguments)
+                      for handler, arguments in group),
+                    return_exceptions=True
+                )
+
+                for result in results:
+                    early_response = self.__handle_result__(context, result)
+                    if early_response is not None:
+                        return early_response
+            else:
+                for handler, arguments in group:
+                    try:
+                        result = await handler(context, in_headers, input, response, **arguments)
+                    except Exception as e:
+                        result = e
 
-        for key, value in handlers.items():
-            for handler in value:
-                arguments = handler[1]
-                handler = handler[0]
-                result = None
+                    early_response = self.__handle_result__(context, result)
+                    if early_response is not None:
+                        return early_response
+
+        return self.codec.encode(response), context
 
-                try:
-                    result = await handler(context, in_headers, input, response, *arguments)
+    def __handle_result__(self, context, result):
+        """Applies the result of a single handler (its return value, or the exception it raised) to ``context``.
 
-                    if result is not None and isinstance(result, int):
-                        context['http_code'] = result
-                except error.Error as e:
-                    if e.reraise:
-                        return self.codec.encode(e)
+        Returns the encoded response if handling must stop here, otherwise None.
+        """
+        if isinstance(result, error.Error):
+            if result.reraise:
+                return self.codec.encode(result)
 
-                    error = self.dict_class()
-                    if e.error_code is not None:
-                        error['code'] = e.error_code
-                    else:
-                        error['code'] = e.http_code
+            err = self.dict_class()
+            if result.error_code is not None:
+                err['code'] = result.error_code
+            else:
+                err['code'] = result.http_code
 
-                    if e.message is not None:
-                        error['message'] = e.message
-                    else:
-                        error['message'] = 'An error has occured.'
+            if result.message is not None:
+                err['message'] = result.message
+            else:
+                err['message'] = 'An error has occured.'
 
-                    if e.short_name is not None:
-                        error['name'] = e.short_name
+            if result.short_name is not None:
+                err['name'] = result.short_name
 
-                    context['error'] = error
-                    context['http_code'] = e.http_code
-                except Exception as e:
-                    return self.codec.encode(e)
+            context['error'] = err
+            context['http_code'] = result.http_code
+        elif isinstance(result, Exception):
+            return self.codec.encode(result)
+        elif isinstance(result, BaseException):
+            raise result
+        elif result is not None and isinstance(result, int):
+            context['http_code'] = result
 
-        return self.codec.encode(response), context
+        return None
 
     @staticmethod
     def __fix_params__(**kwargs):
@@ -157,15 +260,9 @@ class Aspyre:
                 result['ignore_response'] = False
 
         if 'path' in kwargs:
-            result['path'] = kwargs['path']
-
-            # Remove forward and trailing slash from path (if it is there).
+            # Remove forward and trailing slashes from path (if they are there).
             path = kwargs['path']
-            if path:
-                if path[0] == '/':
-                    result['path'] = result['path'][1:]
-                if path[1] == '/':
-                    result['path'] = result['path'][:-1]
+            result['path'] = path.strip('/') if path else path
 
         return result
 
@@ -194,9 +291,12 @@ class AspyreGroup:
             raise ValueError('AspyreGroup.add_instance requires its argument to be an instantiated class of Aspyre.')
 
     async def __call__(self, host, path, method, input, headers=None, query_string=None):
-        handlers, instance = self.find(host, path, method, self.__instances__)
+        if method not in HTTP_METHODS:
+            return self.codec.encode(error.NotImplemented(message="The server does not support this HTTP method."))
 
-        if handlers:
-            return instance.handle(handlers, input, headers, query_string)
-        else:
+        result = self.find(host, path, method, self.__instances__)
+        if result is None:
             return self.codec.encode(error.NotFound(message='No matching handler for URL found.'))
+
+        handlers, instance = result
+        return await instance.handle(handlers, input, headers, query_string)
@@ -1,7 +1,8 @@
 from abc import ABCMeta, abstractmethod
+from copy import copy
 
-import dictionary
-import error
+from . import dictionary
+from . import error
 import json
 
 class Codec(metaclass=ABCMeta):
@@ -56,6 +57,7 @@ class Codec(metaclass=ABCMeta):
 class AspyreJSONCodec(Codec):
     def __init__(self, strict=False):
         self.strict = strict
+        self._blank_class = dictionary.AspyreDictHistory()
 
     def encode(self, output):
         headers = {
@@ -71,4 +73,4 @@ class AspyreJSONCodec(Codec):
         return dictionary.AspyreDictImmutable()
 
     def get_class(self):
-        return dictionary.AspyreDictHistory()
+        return copy(self._blank_class)
@@ -1,34 +1,160 @@
+import functools
 import string
-from collections import MutableMapping, OrderedDict, Mapping
+from collections.abc import MutableMapping, Mapping
+
+
+class _NormTable(dict):
+    """A ``str.translate`` table which keeps lowercase ASCII letters and deletes every other character.
+
+    Characters not yet in the table are resolved (and cached) on first sight, so translation of keys seen
+    before never leaves C.
+    """
+
+    def __missing__(self, char):
+        self[char] = None
+        return None
+
+
+_NORM_TABLE = _NormTable((char, char) for char in map(ord, string.ascii_lowercase))
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _normalize_str(key):
+    # The same handful of keys (header names, 'arguments', 'http_code', ...) are looked up on every request, so
+    # their normalised forms are cached.
+    return key.lower().translate(_NORM_TABLE)
+
+# dict first, so the common case is settled by a plain type check before falling back to the Mapping ABC.
+_DICT_OR_MAP = (dict, Mapping)
+
+
+class AspyreHeaders(dict):
+    """A plain dict for outgoing HTTP headers, with case-insensitive (lower-cased) keys.
+
+    Unlike ``AspyreDict``, keys are only lower-cased, not normalised, as header names are exact apart from case.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key.lower(), value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key.lower())
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+    def setdefault(self, key, default=None):
+        return super().setdefault(key.lower(), default)
+
+    def pop(self, key, *default):
+        return super().pop(key.lower(), *default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            super().__setitem__(key.lower(), value)
+
+    def copy(self):
+        return self.__class__(self)
+
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+
+        result = self.copy()
+        result.update(other)
+        return result
+
+    def __ror__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+
+        result = self.__class__(other)
+        result.update(self)
+        return result
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
 
 
 class AspyreDictImmutable(MutableMapping):
+    # Entries live in _data rather than on the instance, as attribute access is redirected to item access.
+    # _norm_index maps each normalised key to the key it is stored under in _data.
+    __slots__ = ('_data', '_norm_index', '_history')
+
     def __init__(self, old_dict=None):
         if isinstance(old_dict, AspyreDictImmutable):
-            self.__dict__.update(old_dict.__dict__)
-
-            if '__history' in self.__dict__:
-                del self.__dict__['__history']
-        elif isinstance(old_dict, Mapping) or isinstance(old_dict, dict):
-            self.__dict__.update(old_dict)
+            data = dict(old_dict._data)
+            norm_index = dict(old_dict._norm_index)
+        elif isinstance(old_dict, _DICT_OR_MAP):
+            # Keys that normalise to the same value collapse onto the first one, as they would via __setitem__.
+            data = {}
+            norm_index = {}
+            for key, value in old_dict.items():
+                data[norm_index.setdefault(self._normalize(key), key)] = value
         elif old_dict is not None:
             raise TypeError(f"'{self.__class__.__name__}' does not support a 'old_dict' that isn't a dict, Mapping, or None. You gave it a type of '{type(old_dict)}'")
         else:
-            self.__dict__['__history'] = []
+            data = {}
+            norm_index = {}
 
-    def __find_key__(self, key):
-        key_f = ''.join(char for char in str(key).lower() if char in string.ascii_lowercase)
+        object.__setattr__(self, '_data', data)
+        object.__setattr__(self, '_norm_index', norm_index)
 
-        for cls_key in self.__dict__.keys():
-            if key_f == ''.join(char for char in cls_key.lower() if char in string.ascii_lowercase):
-                return True, cls_key
+    @staticmethod
+    def _normalize(key):
+        # Keys are matched case-insensitively on their ASCII letters only, i.e. 'Content-Type' == 'content_type'.
+        # The cache is keyed on the string, as keys which compare equal (1 and True) can have different strings,
+        # and keys that can't be hashed are still normalised.
+        return _normalize_str(str(key))
 
-        return False, key
+    def __find_key__(self, key):
+        real_key = self._norm_index.get(self._normalize(key))
+        if real_key is None:
+            return False, key
+
+        return True, real_key
+
+    def __pop_key__(self, key):
+        real_key = self._norm_index.pop(self._normalize(key), None)
+        if real_key is not None:
+            del self._data[real_key]
+
+    def __copy__(self):
+        # Shallow copy which skips __init__'s type checks; used to stamp out blank dictionaries per request.
+        result = self.__class__.__new__(self.__class__)
+        object.__setattr__(result, '_data', dict(self._data))
+        object.__setattr__(result, '_norm_index', dict(self._norm_index))
+
+        return result
+
+    def __getstate__(self):
+        # Used by pickle and copy.deepcopy, which would otherwise restore the slots through __setattr__ (as items).
+        return {
+            name: getattr(self, name)
+            for cls in self.__class__.__mro__
+            for name in cls.__dict__.get('__slots__', ())
+            if hasattr(self, name)
+        }
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
 
     def __getitem__(self, key):
-        found, key = self.__class__.__find_key__(self, key)
+        found, key = self.__find_key__(key)
         if found:
-            return self.__dict__[key]
+            return self._data[key]
         else:
             return None
 
@@ -39,50 +165,61 @@ class AspyreDictImmutable(MutableMapping):
         raise TypeError(f"'{self.__class__.__name__}' object does not support item assignment.")
 
     def __contains__(self, key):
-        found, _ = self.__class__.__find_key__(self, key)
+        found, _ = self.__find_key__(key)
         return found
 
     def __iter__(self):
-        return iter(self.__dict__)
+        return iter(self._data)
 
     def __len__(self):
-        return len(self.__dict__)
+        return len(self._data)
 
     def __getattr__(self, key):
-        return self.__class__.__getitem__(self, key)
+        # Only reached when normal attribute lookup fails, e.g. for an unset slot or a protocol probe such as
+        # __deepcopy__; those must not be mistaken for keys.
+        if key.startswith('_'):
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{key}'")
+
+        return self[key]
 
     def __delattr__(self, key):
-        return self.__class__.__delitem__(self, key)
+        # The same names as in __getattr__ are attributes, not keys.
+        if key.startswith('_'):
+            object.__delattr__(self, key)
+        else:
+            del self[key]
 
     def __setattr__(self, key, value):
-        return self.__class__.__setitem__(self, key, value)
-
-    def __str__(self):
-        return str(self.__dict__)
+        if key.startswith('_'):
+            object.__setattr__(self, key, value)
+        else:
+            self[key] = value
 
     def __repr__(self, indent=4, level=1):
         if level == 0:
             level = 1
 
         ind = "\n" + ' ' * (indent * level)
-        s = self.__class__.__name__ + '({'
-        for key, value in self.__dict__.items():
-            if key == '__history':
-                continue
+        parts = [self.__class__.__name__, '({']
+        for key, value in self._data.items():
+            parts.append(ind)
+            parts.append(f"'{key}': ")
             if isinstance(value, AspyreDictImmutable):
-                s += ind + f"'{key}': " + value.__repr__(indent=indent, level=(level + 1)) + ","
+                parts.append(value.__repr__(indent=indent, level=(level + 1)))
             else:
-                s += ind + f"'{key}': " + value.__repr__() + ","
+                parts.append(value.__repr__())
+            parts.append(',')
 
-        s += ("\n" + " " * (indent * (level - 1))) + "})"
+        parts.append("\n" + " " * (indent * (level - 1)))
+        parts.append('})')
 
-        return s
+        return ''.join(parts)
 
     def __str__(self):
         return self.__repr__()
 
     def __add__(self, other):
-        if isinstance(other, Mapping) or isinstance(other, dict):
+        if isinstance(other, _DICT_OR_MAP):
             result = self.__class__(self)
             result.update(other)
 
@@ -90,10 +227,10 @@ class AspyreDictImmutable(MutableMapping):
         elif isinstance(other, list):
             result = self.__class__(self)
             for item in other:
-                if isinstance(other, Mapping) or isinstance(other, dict):
+                if isinstance(item, _DICT_OR_MAP):
                     result.update(item)
                 else:
-                    raise TypeError(f"Unsupported type addition {type(other)} to AspyreDict. Must be a map or dict-like object, or a list of those.")
+                    raise TypeError(f"Unsupported type addition {type(item)} to AspyreDict. Must be a map or dict-like object, or a list of those.")
 
             return result
         else:
@@ -102,8 +239,7 @@ class AspyreDictImmutable(MutableMapping):
     def __sub__(self, other):
         if isinstance(other, str):
             result = self.__class__(self)
-            if other in result:
-                del result.__dict__[other]
+            result.__pop_key__(other)
 
             return result
         elif isinstance(other, list):
@@ -119,7 +255,7 @@ class AspyreDictImmutable(MutableMapping):
             raise TypeError(f"Unsupported type substraction {type(other)} to AspyreDict. Must be a string, or a list of strings.")
 
     def __eq__(self, other):
-        for key, value in self.__dict__.items():
+        for key, value in self.items():
             if key not in other:
                 return False
 
@@ -134,83 +270,67 @@ class AspyreDictImmutable(MutableMapping):
 
 
 class AspyreDict(AspyreDictImmutable):
-    def __delitem__(self, key):
-        found, key = super().__find_key__(key)
+    __slots__ = ()
 
-        if found:
-            del self.__dict__[key]
+    def __delitem__(self, key):
+        self.__pop_key__(key)
 
     def __setitem__(self, key, value):
-        _, key = super().__find_key__(key)
+        # Reuse the stored spelling of a key if one normalises to the same value.
+        key = self._norm_index.setdefault(self._normalize(key), key)
         if isinstance(value, AspyreDictImmutable):
-            self.__dict__[key] = value
-        elif isinstance(value, dict) or isinstance(value, Mapping):
-            self.__dict__[key] = self.__class__(value)
+            self._data[key] = value
+        elif isinstance(value, _DICT_OR_MAP):
+            self._data[key] = self.__class__(value)
         else:
-            self.__dict__[key] = value
+            self._data[key] = value
+
 
-    
 class AspyreDictHistory(AspyreDict):
+    # _dirty is set whenever the dictionary changes, and cleared when its state is saved to the history.
+    __slots__ = ('_dirty',)
+
     def __init__(self, old_dict=None):
         super().__init__(old_dict)
 
         if isinstance(old_dict, AspyreDictHistory):
-            self.__dict__['__history'] = list(old_dict.__dict__['__history'])
+            object.__setattr__(self, '_history', list(old_dict._history))
         else:
-            self.__dict__['__history'] = [self]
+            object.__setattr__(self, '_history', [self])
 
-    def __find_key__(self, key):
-        key_f = ''.join(char for char in str(key).lower() if char in string.ascii_lowercase)
+        object.__setattr__(self, '_dirty', True)
 
-        for cls_key in self.__dict__.keys():
-            if cls_key == '__history':
-                continue
+    def __copy__(self):
+        # A copy starts a history of its own, rather than sharing (and appending to) the original's.
+        result = super().__copy__()
+        object.__setattr__(result, '_history', [result])
+        object.__setattr__(result, '_dirty', True)
 
-            if key_f == cls_key:
-                return True, cls_key
-
-        return False, key
-
-    def __getitem__(self, key):
-        key_l = key.lower()
-        if key_l == '__history':
-            return
-
-        return super().__getitem__(key)
+        return result
 
     def __setitem__(self, key, value):
-        key_l = key.lower()
-        if key_l == '__history':
-            raise AttributeError(f"Cannot modify private property '{self.__class__.__name__}.__history'.")
-
         super().__setitem__(key, value)
+        object.__setattr__(self, '_dirty', True)
 
     def __delitem__(self, key):
-        key_l = key.lower()
-        if key_l == '__history':
-            raise AttributeError(f"Cannot delete private property '{self.__class__.__name__}.__history'.")
-
         super().__delitem__(key)
-
-    def __getattribute__(self, key):
-        key_l = key.lower()
-        if key_l == '__history':
-            return
-
-        return super().__getattribute__(key)
+        object.__setattr__(self, '_dirty', True)
 
     def get_current_version(self):
-        return len(self.__dict__['__history'])
+        return len(self._history)
 
     def rollback(self, version=-1):
-        state = self.__dict__['__history'][version]
-        history = state.__dict__['__history']
-        del state.__dict__['__history']
+        state = self._history[version]
 
-        self.__dict__.clear()
-        self.__dict__.update(state.__dict__)
-        self.__dict__['__history'] = list(history)
+        object.__setattr__(self, '_data', dict(state._data))
+        object.__setattr__(self, '_norm_index', dict(state._norm_index))
+        object.__setattr__(self, '_history', list(state._history))
+        # The restored state is no longer the last one in the (truncated) history, so it still needs saving.
+        object.__setattr__(self, '_dirty', True)
 
     def save(self):
-        self.__dict__['__history'].append(self.__class__(self))
+        if self._dirty:
+            self._history.append(self.__class__(self))
+            object.__setattr__(self, '_dirty', False)
+
         return self.get_current_version()
@@ -68,16 +68,18 @@ class Error(Exception):
 
         return result
 
-    def code(self):
-        return HTTPResponses[self.http_code] if hasattr(HTTPResponses, self.http_code) else HTTPResponses[500]
+    def code(self, _responses=HTTPResponses, _default=HTTPResponses[500]):
+        # HTTPResponses is bound as a default as it is removed from the module's globals below.
+        return _responses.get(self.http_code, _default)
 
 
-def _return_error_class(http_code):
-    class E(Error):
-        def __init__(self, error_code=None, message=None, short_name=None, reraise=False):
-            super().__init__(http_code=http_code, error_code=error_code, message=message, short_name=short_name, reraise=reraise)
+def _error_init(self, error_code=None, message=None, short_name=None, reraise=False):
+    Error.__init__(self, http_code=self.__class__.http_code, error_code=error_code, message=message, short_name=short_name, reraise=reraise)
 
-    return E
+
+def _return_error_class(class_name, http_code):
+    # Every generated class shares _error_init, and reads its status code from the class attribute.
+    return type(class_name, (Error,), {'http_code': http_code, '__init__': _error_init})
 
 
 for status_code, text in HTTPResponses.items():
@@ -86,8 +88,9 @@ for status_code, text in HTTPResponses.items():
 
     # Remove all non-alphabetic characters from the string and capitalise each word.
     class_name = ''.join([s.capitalize() for s in ''.join([c for c in text if c.isalpha() or c == ' ']).split(' ')])
-    globals()[class_name] = _return_error_class(status_code)
+    globals()[class_name] = _return_error_class(class_name, status_code)
 
 # Clear all private definitions within this module from being imported.
 del globals()['HTTPResponses']
 del globals()['_return_error_class']
+del globals()['_error_init']
@@ -1,24 +1,40 @@
 import abc
+import builtins
+import functools
 import re
-from collections import Mapping
-
-import datetime
-import uuid
-import base64
+from collections.abc import Mapping
 
 
 __re_type = type(re.compile(''))
-__default_types__ = {
-    'str': str,
-    'strl': str.lower,
-    'stru': str.upper,
-    'int': int,
-    'float': float,
-    'date': lambda s: datetime.date(*map(int, s.split('-'))),
-    'timestamp': lambda s: datetime.datetime.fromtimestamp(int(s)),
-    'uuid': uuid.UUID,
-    'base64': lambda s: str(base64.urlsafe_b64decode(s), 'ascii'),
-}
+_escape = re.escape
+
+
+@functools.lru_cache(maxsize=1)
+def _get_default_types():
+    # Built on first use, so that importing this module doesn't pull in datetime, uuid and base64.
+    import base64
+    import datetime
+    import types
+    import uuid
+
+    return types.MappingProxyType({
+        'str': str,
+        'strl': str.lower,
+        'stru': str.upper,
+        'int': int,
+        'float': float,
+        'date': lambda s: datetime.date(*map(int, s.split('-'))),
+        'timestamp': lambda s: datetime.datetime.fromtimestamp(int(s)),
+        'uuid': uuid.UUID,
+        'base64': lambda s: str(base64.urlsafe_b64decode(s), 'ascii'),
+    })
+
+
+def __getattr__(name):
+    if name == '__default_types__':
+        return _get_default_types()
+
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
 
 
 class URLClass(metaclass=abc.ABCMeta):
@@ -28,6 +44,8 @@ class URLClass(metaclass=abc.ABCMeta):
 
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def __init__(self, types=None):
         pass
@@ -61,16 +79,63 @@ class Regex(URLClass):
 
     """
 
-    __separator__ = '0_d_collis_1'  # Mangling workaround for Python regex named groups not allowing a ':' character.
-    __re_group_match = re.compile("\(\?P\<([^\>\:]+)\:?([^\>]*)\>([^\)]+)\)")
+    # Private names are mangled here too, e.g. '__url_list' becomes '_Regex__url_list'.
+    __slots__ = ('__url_list', '__by_count', '__glob_routes', '__trie_root', '__route_count', '__scans', '__scan_limit',
+                 '__types')
+
+    __separator__ = '__X__'  # Mangling workaround for Python regex named groups not allowing a ':' character.
+    __host_path_separator__ = '\x1f'  # Joins a host and path for routes which match both in one expression.
+    __re_group_match = re.compile(r"\(\?P\<([^\>\:]+)\:?([^\>]*)\>([^\)]+)\)", re.ASCII)
+
+    # A path segment that is plain text, allowing for characters escaped by `re.escape` (other than '/').
+    __re_literal_segment = re.compile(r'(?:[^\\.^$*+?{}\[\]|()]|\\[^A-Za-z0-9/])*')
+    # A path segment that is exactly one named group, which can never match a '/' (so can never span segments).
+    __re_param_segment = re.compile(r"""
+        \(\?P<(?P<key>\w+)>
+        (?P<body>(?:
+            (?:
+                \[\^(?:[^\]\\]|\\.)*?\\?/(?:[^\]\\]|\\.)*\]                          # [^/...], any class excluding '/'
+              | \[-?(?:[A-Za-z0-9]-[A-Za-z0-9]|[A-Za-z0-9_.]|\\[dw.\-_])+-?\]     # [a-z0-9_.-], and the like
+              | \\[dw.\-_]
+              | [A-Za-z0-9_\-]
+            )
+            (?:[+*?]|\{\d+(?:,\d*)?\})?\??
+        )+)
+        \)""", re.VERBOSE)
+    # A path segment that can never match a '/': no '.', no class or escape that may include '/', and no '/'.
+    __re_slash_free_segment = re.compile(r"""(?:
+        [^\\.\[\]/]
+      | \\[dwsbBAZ]
+      | \\[^A-Za-z0-9/]
+      | \[\^(?:[^\]\\]|\\.)*?\\?/(?:[^\]\\]|\\.)*\]
+      | \[-?(?:[A-Za-z0-9]-[A-Za-z0-9]|[A-Za-z0-9_.]|\\[dw.\-_])+-?\]
+    )*""", re.VERBOSE)
 
     def __init__(self, types=None):
+        # (route number, (host, path, host and path combined), cls, decoders, matchers) for routes which can't be
+        # stored in the trie, where decoders maps each named group to its (conversion function, argument name), and
+        # matchers holds the bound fullmatch method of each of the three patterns (or None).
         self.__url_list = []
-        if types and not (isinstance(types, dict) or isinstance(types, Mapping)):
+        # The same routes, bucketed by the number of '/' characters a path they match must have. Routes which may
+        # match any number of '/' characters (above a minimum) are kept as (minimum, route) in __glob_routes.
+        self.__by_count = {}
+        self.__glob_routes = []
+        # Routes whose paths are made of literal and single named group segments, keyed on path segments. Each
+        # node holds its literal children, its named group children (keyed by regex, with its bound fullmatch), and
+        # the routes ending there as (route number, cls, host fullmatch, group keys, decoders).
+        self.__trie_root = {'children': {}, 'params': {}, 'leaf': []}
+        self.__route_count = 0
+        # Per '/' count, the path-only routes of __by_count and __glob_routes scanned in a single regular expression
+        # (see __scan). Built on first use, and cleared whenever a route is added. Counts at or above
+        # __scan_limit all try the same routes, so share one entry.
+        self.__scans = {}
+        self.__scan_limit = 0
+        if types is not None and not isinstance(types, Mapping):
             raise TypeError("'types' in URLClass init does not have a dict-like type. It is of type '{}'.".format(type(types)))
 
         self.__types = types if types else {}
 
+    @staticmethod
     def __replacement_strategy__(match):
         # (?P<type:name>regex)
         type = match.group(1)
@@ -80,7 +145,24 @@ class Regex(URLClass):
         if not name:
             return "(?P<{}>{})".format(type, regex)
         else:
-            return "(?<{}{}{}>{})".format(type, Regex.__seperator__, name, regex)
+            return "(?P<{}{}{}>{})".format(type, Regex.__separator__, name, regex)
+
+    # A named group, or a reference to one, skipping over escaped characters.
+    __re_group_name = re.compile(r'(\\.)|\(\?P(<|=)(\w+)(>|\))', re.ASCII | re.DOTALL)
+    # Numbered references, which would point at the wrong group once the route is part of a larger expression.
+    __re_numbered_reference = re.compile(r'\\[1-9]|\(\?\(\d')
+    # Anchors and lookarounds, which would see the other half of a combined host and path. Errs on the side of
+    # finding one (e.g. an escaped '$'), apart from the '^' opening a negated character class.
+    __re_context_sensitive = re.compile(r'(?<!\[)\^|\$|\\[AZbB]|\(\?<?[=!]')
+
+    @staticmethod
+    def __rewrite_groups(url):
+        # Rewrites any '(?P<type:name>regex)' groups into valid named groups. Most URLs have none, so skip the
+        # substitution for those.
+        if '(?P<' not in url:
+            return url
+
+        return Regex.__re_group_match.sub(Regex.__replacement_strategy__, url)
 
     def add_route(self, cls, *urls):
         """Adds a handler class for a variety of regular expression-based URLs.
@@ -115,6 +197,8 @@ class Regex(URLClass):
                     - when supplying an element that is not a tuple and not a string,
                     - when supplying a string (by itself, or within a tuple) that is supposed to match a path
                     that does not begin with a forward slash.
+            AttributeError: Raised when a named group does not have a key that can be found in the ``types``
+                dictionary, and therefore a conversion to the desired type cannot be performed.
 
         """
 
@@ -128,25 +212,246 @@ class Regex(URLClass):
                     raise ValueError("URL specified in a tuple (host, path) must be a string. You gave '{}' of type '{}' as a second argument.".format(url[1], type(url[1]).__name__))
 
                 if url[0]:
-                    url[0] = Regex.__re_group_match.sub(Regex.__replacement_strategy__, url[0])
-                    host = re.compile(url[0])
+                    host_src = Regex.__rewrite_groups(url[0])
+                    host = re.compile(host_src)
                 if url[1]:
-                    if url[1][0] == '/':  # Check that the path string begins with a '/'
-                        url[1] = Regex.__re_group_match.sub(Regex.__replacement_strategy__, url[1][1:])
-
-                        path = re.compile(url[1])
+                    if url[1].startswith('/'):  # Check that the path string begins with a '/'
+                        path_src = Regex.__rewrite_groups(url[1][1:])
+                        path = re.compile(path_src)
                     else:
                         raise ValueError("URL path string's  must begin with a '/'. You gave '{}'.".format(url[1]))
             elif isinstance(url, str):
-                if url[0] == '/':  # Check that the path string begins with a '/'
-                    url = Regex.__re_group_match.sub(Regex.__replacement_strategy__, url[1:])
+                if url.startswith('/'):  # Check that the path string begins with a '/'
+                    url = Regex.__rewrite_groups(url[1:])
                     path = re.compile(url)
                 else:
                     raise ValueError("URL string's can only match paths and must begin with a '/'. You gave '{}'.".format(url))
             else:
                 raise ValueError("URL must either be a string representing a path or a tuple representing (host, tuple). You gave '{}' of type '{}'.".format(url, type(url).__name__))
-                
-            self.__url_list.append(((host, path), cls))
+
+            number = self.__route_count
+            self.__route_count += 1
+
+            decoders = {}
+            for pattern in (host, path):
+                if pattern is not None:
+                    for key in pattern.groupindex:
+                        decoders[key] = self.__decoder(key)
+
+            if path is None or not self.__add_to_trie(number, cls, host, path, decoders):
+                combined = None
+                if host is not None and path is not None and Regex.__combinable(host) and Regex.__combinable(path):
+                    # Match host and path in one pass, e.g. 'host\x1fpath' for URL 'host/path'.
+                    try:
+                        combined = re.compile('(?:{}){}(?:{})'.format(host.pattern, Regex.__host_path_separator__, path.pattern))
+                    except re.error:
+                        pass  # E.g. the same group name in both host and path; match them separately instead.
+
+                matchers = tuple(pattern.fullmatch if pattern is not None else None for pattern in (host, path, combined))
+                route = (number, (host, path, combined), cls, decoders, matchers)
+                self.__url_list.append(route)
+
+                segments = Regex.__split_segments(path.pattern) if path is not None else None
+                if segments is None:
+                    self.__glob_routes.append((0, route))
+                elif all(Regex.__re_slash_free_segment.fullmatch(segment) for segment in segments):
+                    self.__by_count.setdefault(len(segments) - 1, []).append(route)
+                else:
+                    self.__glob_routes.append((len(segments) - 1, route))
+
+                self.__scans.clear()
+                self.__scan_limit = max(self.__scan_limit, len(segments) if segments is not None else 1)
+
+    @staticmethod
+    def __combinable(pattern):
+        # Whether the pattern matches the same way when joined to another: no inline flags (which would apply to
+        # both), numbered references (which would be renumbered), anchors or lookarounds.
+        return pattern.flags == re.UNICODE and not Regex.__re_numbered_reference.search(pattern.pattern) \
+            and not Regex.__re_context_sensitive.search(pattern.pattern)
+
+    def __decoder(self, key):
+        # Splits a named group's key into the function that converts its value and the argument name it is passed
+        # as. Groups named without a type (e.g. '(?P<name>...)') are passed on as strings.
+        if Regex.__separator__ not in key:
+            return str, key
+
+        t, _, name = key.partition(Regex.__separator__)  # Type, name
+        if t in self.__types:
+            return self.__types[t], name
+
+        func = getattr(builtins, t, None)
+        if func is not None:
+            return func, name
+
+        raise AttributeError("Can't find a callable / type cast function with the name '{}' referenced in URL group '{}'.".format(t, key))
+
+    def __add_to_trie(self, number, cls, host, path, decoders):
+        """Stores a route in the trie if every segment of its path is either literal text or a single named group.
+
+        Returns:
+            bool: Whether the route was stored. If not, it must be matched with its full regular expression.
+        """
+        segments = Regex.__split_segments(path.pattern)
+        if segments is None:
+            return False
+
+        steps = []
+        keys = []
+        for segment in segments:
+            if Regex.__re_literal_segment.fullmatch(segment):
+                steps.append(('children', re.sub(r'\\(.)', r'\1', segment)))
+                continue
+
+            m = Regex.__re_param_segment.fullmatch(segment)
+            if m is None:
+                return False
+
+            steps.append(('params', m.group('body')))
+            keys.append(m.group('key'))
+
+        node = self.__trie_root
+        for kind, key in steps:
+            children = node[kind]
+            if key not in children:
+                child = {'children': {}, 'params': {}, 'leaf': []}
+                children[key] = child if kind == 'children' else (re.compile(key).fullmatch, child)
+
+            node = children[key] if kind == 'children' else children[key][1]
+
+        node['leaf'].append((number, cls, host.fullmatch if host is not None else None, tuple(keys), decoders))
+        return True
+
+    @staticmethod
+    def __split_segments(pattern):
+        # Splits a regular expression on the '/' characters that aren't within a group or character class, or
+        # returns None if the expression has a top-level alternation (which may span segments).
+        segments = []
+        start = 0
+        depth = 0
+        in_class = False
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == '\\':
+                i += 2
+                continue
+
+            if in_class:
+                in_class = char != ']'
+            elif char == '[':
+                in_class = True
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif depth == 0:
+                if char == '|':
+                    return None
+                if char == '/':
+                    segments.append(pattern[start:i])
+                    start = i + 1
+
+            i += 1
+
+        segments.append(pattern[start:])
+        return segments
+
+    def __routes_for(self, count):
+        """Returns the routes which can match a path with ``count`` '/' characters.
+
+        Returns:
+            tuple: ``(scan, scanned, routes)``, where ``scan`` is a regular expression (or None) that matches every
+            route in ``scanned`` against the path at once, as ``(route, marker group, [(group, key)])`` entries.
+            The ``routes`` must be tried one by one. Both are in the order declared.
+        """
+        if count > self.__scan_limit:
+            count = self.__scan_limit
+
+        entry = self.__scans.get(count)
+        if entry is None:
+            routes = list(self.__by_count.get(count, ()))
+            routes.extend(route for minimum, route in self.__glob_routes if count >= minimum)
+            routes.sort(key=lambda route: route[0])  # In the order declared, so find_one can stop at the first match.
+            entry = self.__scans[count] = Regex.__scan(routes)
+
+        return entry
+
+    @staticmethod
+    def __scan(routes):
+        # Joins the path-only routes into one expression of optional lookaheads, each matching a whole path, so one
+        # C-level match finds all of them (an alternation of them would only find the first). Named groups are
+        # prefixed with 'r<route number>_' to keep them apart.
+        parts = []
+        scanned = []
+        others = []
+        for route in routes:
+            number, u, _, _, _ = route
+            path = u[1]
+            prefix = 'r{}_'.format(number)
+            renamed = None
+            if u[0] is None and path is not None and path.flags == re.UNICODE \
+                    and not Regex.__re_numbered_reference.search(path.pattern):
+                renamed = Regex.__re_group_name.sub(
+                    lambda m: m.group(1) or '(?P{}{}{}{}'.format(m.group(2), prefix, m.group(3), m.group(4)),
+                    path.pattern)
+                try:
+                    check = re.compile(renamed)
+                except re.error:
+                    renamed = None
+                else:
+                    if check.groups != path.groups or set(check.groupindex) != {prefix + key for key in path.groupindex}:
+                        renamed = None
+
+            if renamed is None:
+                others.append(route)
+                continue
+
+            parts.append('(?:(?=(?:{})\\Z)(?P<r{}>))?'.format(renamed, number))
+            scanned.append((route, prefix))
+
+        if len(scanned) < 2:
+            return None, (), routes
+
+        try:
+            scan = re.compile(''.join(parts))
+        except (re.error, RecursionError):
+            return None, (), routes
+
+        index = scan.groupindex
+        scanned = tuple(
+            (route, index[prefix[:-1]], [(index[prefix + key], key) for key in route[1][1].groupindex])
+            for route, prefix in scanned
+        )
+        return scan, scanned, tuple(others)
+
+    @staticmethod
+    def __walk(node, segments, index, values, host, matches):
+        if index == len(segments):
+            for number, cls, host_match, keys, decoders in node['leaf']:
+                args = {}
+                if host_match is not None:
+                    m = host_match(host) if host else None
+                    if m is None:
+                        continue
+
+                    args.update(m.groupdict())
+
+                args.update(zip(keys, values))
+                matches.append((number, cls, args, decoders))
+
+            return
+
+        segment = segments[index]
+
+        child = node['children'].get(segment)
+        if child is not None:
+            Regex.__walk(child, segments, index + 1, values, host, matches)
+
+        for fullmatch, child in node['params'].values():
+            if fullmatch(segment):
+                values.append(segment)
+                Regex.__walk(child, segments, index + 1, values, host, matches)
+                values.pop()
 
     def find(self, host, path):
         """Matches an incoming URL, and if found, will return all classes in the order declared that matches
@@ -167,53 +472,128 @@ class Regex(URLClass):
             list (`aspyre.Resource`): A list structure that contains all the classes that can handle the
             the request in the order declared.
 
-        Raises:
-            AttributeError: Raised when a named group does not have a key that can be found in the ``types``
-                dictionary, and therefore a conversion to the desired type cannot be performed.
-
         """
 
         handlers = []
+        seen = set()
+        for _, cls, args, decoders in self.__matches(host, path):
+            # Make sure that the handler has not already been returned (we don't execute it more than once)
+            cid = id(cls)
+            if cid in seen:
+                continue
+            seen.add(cid)
+
+            handlers.append((cls, Regex.__convert(args, decoders)))
+
+        return handlers
+
+    def find_one(self, host, path):
+        """Matches an incoming URL like ``find``, but only returns the first class declared that matches it.
+
+        Args:
+            host (`str`): The host portion of a URL to match (optional).
+            path (`str`): The path portion of a URL to match (optional).
+
+        Returns:
+            tuple: The `(cls, arguments)` pair of the first match, or an empty tuple if nothing matched.
+
+        """
+
+        matches = self.__matches(host, path, first=True)
+        if not matches:
+            return ()
+
+        _, cls, args, decoders = matches[0]
+        return cls, Regex.__convert(args, decoders)
+
+    @staticmethod
+    def __convert(args, decoders):
+        # Return arguments, converted with the functions looked up when the route was added. Groups which didn't
+        # participate in the match are passed as None.
+        return {
+            name: (fn(value) if value is not None else None)
+            for key, value in args.items()
+            for fn, name in (decoders[key],)
+        }
+
+    def __matches(self, host, path, first=False):
+        # Returns every route matching the URL as (route number, cls, named groups, decoders), in the order declared.
+        # If only the first is wanted, the remaining routes stop being tried once it is certain that none declared
+        # before the best match so far can match.
+        matches = []
+
+        # Routes in the trie are found by walking the path's segments, without running their regular expressions.
+        if path is not None:
+            Regex.__walk(self.__trie_root, path.split('/'), 0, [], host, matches)
+
+        limit = None  # The number of the earliest route matched so far, if only the first match is wanted.
+        if first and matches:
+            limit = min(match[0] for match in matches)
+
+        host_path = None
+        if host and path is not None:  # Routes with a host pattern never match without a host.
+            host_path = host + Regex.__host_path_separator__ + path
+            if host_path.count(Regex.__host_path_separator__) != 1:
+                host_path = None  # The separator is part of the host or path, so it can't be split unambiguously.
+
+        # Only routes which can match a path with this many '/' characters need to be tried.
+        if path is not None:
+            scan, scanned, routes = self.__routes_for(path.count('/'))
+            if scan is not None:
+                m = scan.match(path)
+                for (number, _, cls, decoders, _), marker, groups in scanned:
+                    if limit is not None and number > limit:
+                        break
+                    if m.group(marker) is not None:
+                        matches.append((number, cls, {key: m.group(group) for group, key in groups}, decoders))
+                        if first:
+                            limit = number
+                            break
+        else:
+            routes = [route for _, route in self.__glob_routes]
+
+        for number, _, cls, decoders, u in routes:
+            if limit is not None and number > limit:
+                break
 
-        for u in self.__url_list:
-            cls = u[1]  # Extract the handling class.
-            u = u[0]  # Extract the URL.
+            if u[2] is not None and host_path is not None:
+                m = u[2](host_path)
+                if m:
+                    matches.append((number, cls, m.groupdict(), decoders))
+                    if first:
+                        break
+                continue
 
             m1, m2 = None, None  # Match 1, Match 2
             args = {}
-            if u[0]:  # Match 1 (match host)
-                m1 = re.fullmatch(u[0], host)
-                if m1:
-                    args.update(m1.groupdict())
-
-            if u[1]:  # Match 2 (match path)
-                m2 = re.fullmatch(u[1], path)
-                if m2:
-                    args.update(m2.groupdict())
+            if u[0] is not None:  # Match 1 (match host)
+                if not host:
+                    continue  # The route needs a host, but there isn't one to match against.
+                m1 = u[0](host)
+                if not m1:
+                    continue
+                args.update(m1.groupdict())
+
+            if u[1] is not None:  # Match 2 (match path)
+                if path is None:
+                    continue
+                m2 = u[1](path)
+                if not m2:
+                    continue
+                args.update(m2.groupdict())
 
             if m1 or m2:
-                ret_args = {}  # Return arguments
-                for key, value in args.items():
-                    # key = key[1:][:-1]  # Remove angle brackets from string.
-                    t, name = key.split(Regex.__separator__)  # Type, name
-                    if t in self.__types:
-                        value = self.__types[t](value)
-                    else:
-                        func = globals()['__builtins__'][t]
-                        if func:
-                            value = func(value)
-                        else:
-                            raise AttributeError("Can't find a callable / type cast function with the name '{}' referenced in URL tuple '{}'.".format(t, u))
+                matches.append((number, cls, args, decoders))
+                if first:
+                    break
 
-                    ret_args[name] = value
+        if len(matches) > 1:
+            matches.sort(key=lambda match: match[0])  # Back into the order declared.
 
-                # Make sure that the handler has not already been returned (we don't execute it more than once)
-                if cls not in handlers:
-                    handlers.append((cls, ret_args))
-
-        return handlers
+        return matches
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def group(type, name):
         """Creates a regular expression named group that can be used for URL arguments inside a URL path.
 
@@ -233,11 +613,11 @@ class Regex(URLClass):
             str: A string that can be added to a regular expression.
             
                 For example, for arguments `type='str'` and `name='username'`, the result would be something
-                like: '(?P<str0_d_collis_1username>[^\/]+)' (which will match all characters until the next
+                like: '(?P<str__X__username>[^\\/]+)' (which will match all characters until the next
                 forward slash in the URL).
         """
 
-        return '(?P<' + type + Regex.__separator__ + name + '>[^\/]+)'
+        return '(?P<' + type + Regex.__separator__ + name + r'>[^\/]+)'
 
 
 class Simple(Regex):
@@ -259,7 +639,8 @@ class Simple(Regex):
             contains basic data types like `str`, and `int`.
 
     """
-    __re_args = re.compile('\<[^\>]*\>')
+    __slots__ = ()
+    __re_args = re.compile(r'\<[^\>]*\>', re.ASCII)
 
     def __init__(self, types=None):
         super().__init__(types)
@@ -287,24 +668,214 @@ class Simple(Regex):
             if not isinstance(url, str):
                 raise TypeError("URL must be a string type for Simple routing. You gave a type of '{}' for url '{}'.".format(type(url).__name__, url))
 
-            if len(url) > 0 and url[0] == '/':
+            if url.startswith('/'):
                 url = url[1:]
-            if len(url) > 0 and url[-1] == '/':
+            if url.endswith('/'):
                 url = url[:-1]
 
+            if '<' not in url:  # No arguments, so the URL is matched as is.
+                super().add_route(cls, '/' + _escape(url))
+                continue
+
             last_index = 0
-            parsed_url = '/'
+            parts = ['/']
             for m in Simple.__re_args.finditer(url):
                 # Copy the existing URL up until the match point.
-                parsed_url = parsed_url + re.escape(url[last_index:m.start()])
-                # Strip the angle brackets and group key and name.
-                key = Simple.group(*(m.group()[1:][:-1].split(':')))  
-                # Replace the match with its regex equivalent named group.
-                parsed_url = parsed_url + key
+                parts.append(_escape(url[last_index:m.start()]))
+                # Strip the angle brackets and group key and name, and replace the match with its regex
+                # equivalent named group.
+                parts.append(Simple.group(*(m.group()[1:-1].split(':'))))
                 # Recalculate the last_index
-                last_index = m.start() + len(m.group())
+                last_index = m.end()
 
             if last_index != len(url):
-                parsed_url = parsed_url + re.escape(url[last_index:])
+                parts.append(_escape(url[last_index:]))
+
+            super().add_route(cls, ''.join(parts))
+
+
+class _TrieNode:
+    __slots__ = ('static', 'param', 'wildcard', 'leaves')
+
+    def __init__(self):
+        self.static = {}  # Literal path segment -> child node.
+        self.param = None  # Child node for a `<type:name>` segment.
+        self.wildcard = None  # Child node for a trailing `*` segment.
+        self.leaves = []  # (route number, cls, ((convert, name), ...)) for routes ending at this node.
+
+
+class Trie(URLClass):
+    """A URL class that matches paths segment by segment instead of with regular expressions.
+
+    Routes are declared with the same `<type:name>` syntax as ``Simple``, with the restriction that an
+    argument must make up a whole path segment: `'/products/<int:product_id>'` is fine, but
+    `'/products/id-<int:product_id>'` is not. A `<name>` segment is shorthand for `<str:name>`, and a final `*`
+    segment matches whatever remains of the path (at least one segment).
+
+    Routes are stored in a tree keyed on path segments, so finding a match costs a dictionary lookup per
+    segment of the requested path, no matter how many routes have been added.
+
+    Args:
+        types (`dict`): A key-value data structure where the keys are the data types to be supported in the
+            URL, and the values are callables which is the method used to convert the string to the necessary
+            data type.
+
+            If no `types` value is supplied, then the default is to use the `builtins` dictionary, which
+            contains basic data types like `str`, and `int`.
+
+    """
+
+    __slots__ = ('__types', '__roots', '__route_count')
+
+    def __init__(self, types=None):
+        if types is not None and not isinstance(types, Mapping):
+            raise TypeError("'types' in URLClass init does not have a dict-like type. It is of type '{}'.".format(type(types)))
+
+        self.__types = types if types else {}
+        self.__roots = {}  # Host -> root node of its tree. The None host matches any host.
+        self.__route_count = 0
+
+    def add_route(self, cls, *urls):
+        """Adds a handler class for a variety of URLs.
+
+        Args:
+            cls (`Aspyre.Resource`): The class that will handle these routes.
+            *urls: Path strings, or a tuple of two strings `(host, path)`. Paths must begin with a forward
+                slash. A host must match the host portion of a URL exactly, or be None to match any host.
+
+        Raises:
+            ValueError: Raised when a URL is malformed (not a string or `(host, path)` tuple, a path that does
+                not begin with a forward slash, a `*` segment that is not the last segment, or a `<type:name>`
+                argument that doesn't make up a whole segment).
+            AttributeError: Raised when a `<type:name>` segment references a type that cannot be found in
+                ``types`` or `builtins`.
 
-            super().add_route(cls, parsed_url)
+        """
+
+        for url in urls:
+            host = None
+            if isinstance(url, tuple) and len(url) == 2:
+                host, url = url
+                if host is not None and not isinstance(host, str):
+                    raise ValueError("URL specified in a tuple (host, path) must be a string. You gave '{}' of type '{}' as a first argument.".format(host, type(host).__name__))
+
+            if not isinstance(url, str):
+                raise ValueError("URL must either be a string representing a path or a tuple representing (host, path). You gave '{}' of type '{}'.".format(url, type(url).__name__))
+            if not url.startswith('/'):
+                raise ValueError("URL path string's must begin with a '/'. You gave '{}'.".format(url))
+
+            node = self.__roots.get(host)
+            if node is None:
+                node = self.__roots[host] = _TrieNode()
+
+            params = []
+            segments = url.strip('/').split('/')
+            for i, segment in enumerate(segments):
+                if segment == '*':
+                    if i != len(segments) - 1:
+                        raise ValueError("A '*' can only be the last segment of a URL path. You gave '{}'.".format(url))
+
+                    if node.wildcard is None:
+                        node.wildcard = _TrieNode()
+                    node = node.wildcard
+                elif '<' in segment or '>' in segment:
+                    if not (segment.startswith('<') and segment.endswith('>')) or '<' in segment[1:-1] \
+                            or '>' in segment[1:-1]:
+                        raise ValueError("A '<type:name>' argument must make up a whole segment of a URL path. You gave '{}'.".format(url))
+
+                    type_name, _, name = segment[1:-1].rpartition(':')
+                    params.append((self.__find_type(type_name or 'str', url), name))
+
+                    if node.param is None:
+                        node.param = _TrieNode()
+                    node = node.param
+                else:
+                    child = node.static.get(segment)
+                    if child is None:
+                        child = node.static[segment] = _TrieNode()
+                    node = child
+
+            node.leaves.append((self.__route_count, cls, tuple(params)))
+            self.__route_count += 1
+
+    def __find_type(self, type, url):
+        if type in self.__types:
+            return self.__types[type]
+
+        func = getattr(builtins, type, None)
+        if not callable(func):
+            raise AttributeError("Can't find a callable / type cast function with the name '{}' referenced in URL '{}'.".format(type, url))
+
+        return func
+
+    def find(self, host, path):
+        """Matches an incoming URL, and if found, will return all classes in the order declared that matches
+        the URL.
+
+        Like ``Regex.find``, *all* matching classes are returned, whether or not they can handle the request,
+        and a class is only returned once. Unlike ``Regex.find`` (and so ``Simple``), which raises the
+        `ValueError`, a route does not match if one of its arguments fails to convert to its type with a
+        `ValueError`. Leading and trailing slashes of the path are ignored. Routes added for the request's host
+        are tried alongside those added without a host, in the order declared.
+
+        Args:
+            host (`str`): The host portion of a URL to match (optional).
+            path (`str`): The path portion of a URL to match.
+
+        Returns:
+            list: A list of `(cls, arguments)` tuples in the order declared, where `arguments` is a
+            dictionary of the converted URL arguments.
+
+        """
+
+        segments = path.strip('/').split('/') if path else ['']
+
+        matches = []
+        if host is not None and host in self.__roots:
+            Trie.__descend(self.__roots[host], segments, 0, [], matches)
+        if None in self.__roots:
+            Trie.__descend(self.__roots[None], segments, 0, [], matches)
+
+        if len(matches) > 1:
+            matches.sort(key=lambda match: match[0])
+
+        handlers = []
+        seen = set()
+        for _, cls, args in matches:
+            # Make sure that the handler has not already been returned (we don't execute it more than once)
+            cid = id(cls)
+            if cid not in seen:
+                seen.add(cid)
+                handlers.append((cls, args))
+
+        return handlers
+
+    @staticmethod
+    def __descend(node, segments, index, values, matches):
+        if index == len(segments):
+            Trie.__bind(node, values, matches)
+            return
+
+        segment = segments[index]
+
+        child = node.static.get(segment)
+        if child is not None:
+            Trie.__descend(child, segments, index + 1, values, matches)
+
+        if node.param is not None and segment:
+            values.append(segment)
+            Trie.__descend(node.param, segments, index + 1, values, matches)
+            values.pop()
+
+        if node.wildcard is not None and segment:
+            Trie.__bind(node.wildcard, values, matches)
+
+    @staticmethod
+    def __bind(node, values, matches):
+        for number, cls, params in node.leaves:
+            try:
+                args = {name: convert(value) for (convert, name), value in zip(params, values)}
+            except ValueError:
+                continue  # The segment isn't of the declared type (e.g. 'new' for `<int:id>`), so no match.
+
+            matches.append((number, cls, args))
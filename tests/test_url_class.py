@@ -0,0 +1,259 @@
+import builtins
+import random
+import re
+import unittest
+
+from aspyre.url_class import Regex, Trie
+
+
+INT = r'(?P<int{}number>\d+)'.format(Regex.__separator__)
+
+# Paths of each kind Regex stores differently: in the trie, bucketed by '/' count, scanned together, or tried on
+# their own (host patterns, inline flags, numbered references).
+ROUTES = [
+    '/items/(?P<item>[^/]+)',
+    '/items/new',
+    '/items/' + INT,
+    '/a/b',
+    '/a/x(?P<tail>[a-z]*)',
+    '/a/.+',
+    '/(?P<rest>.*)',
+    '/a/(?P<first>[^/]+)/(?P<second>.+)',
+    '/(?:a|b)/c',
+    '/.*b',
+    '/(?P<left>a)|(?P<right>b)/c',
+    '/(?i)a/b',
+    r'/(a)/\1',
+    '/a/(?P<same>[a-z]+)/(?P=same)',
+    (r'^api\.example\.com$', '/items/.*'),
+    (r'(?P<sub>\w+)\.example\.com', '/a/(?P<page>[^/]+)'),
+    (r'(?P<sub>\w+)\.example\.com', '/items/(?P<item>[^/]+)'),
+    ('.*', '/a/.*'),
+    (r'\w+\.example\.com', None),
+    ('(?=api).*', '/b'),
+]
+
+HOSTS = [None, '', 'api.example.com', 'www.example.com', 'example.org']
+PATHS = [None, '', 'a', 'b', 'a/b', 'A/B', 'a/a', 'a/xyz', 'a/x', 'a/b/c', 'b/c', 'a/b/b', 'a/abc/abc',
+         'items/new', 'items/12', 'items/x', 'items/x/y', 'zzb']
+
+
+def reference_find(routes, host, path):
+    """Matches every route in turn, the way Regex.find is documented to."""
+    handlers = []
+    for cls, url in routes:
+        host_src, path_src = url if isinstance(url, tuple) else (None, url)
+
+        args = {}
+        matched = False
+        if host_src is not None:
+            m = re.fullmatch(host_src, host) if host else None
+            if m is None:
+                continue
+            args.update(m.groupdict())
+            matched = True
+
+        if path_src is not None:
+            m = re.fullmatch(path_src[1:], path) if path is not None else None
+            if m is None:
+                continue
+            args.update(m.groupdict())
+            matched = True
+
+        if not matched or any(cls is found for found, _ in handlers):
+            continue
+
+        converted = {}
+        for key, value in args.items():
+            type, _, name = key.rpartition(Regex.__separator__)
+            converted[name] = getattr(builtins, type or 'str')(value) if value is not None else None
+        handlers.append((cls, converted))
+
+    return handlers
+
+
+class RegexFindTest(unittest.TestCase):
+    def assert_matches_reference(self, routes):
+        url_class = Regex()
+        for cls, url in routes:
+            url_class.add_route(cls, url)
+
+        for host in HOSTS:
+            for path in PATHS:
+                if host is None and path is None:
+                    continue
+
+                expected = reference_find(routes, host, path)
+                with self.subTest(routes=[url for _, url in routes], host=host, path=path):
+                    self.assertEqual(url_class.find(host, path), expected)
+                    self.assertEqual(url_class.find_one(host, path), expected[0] if expected else ())
+
+    def test_each_route(self):
+        for url in ROUTES:
+            self.assert_matches_reference([(type('Handler', (), {}), url)])
+
+    def test_all_routes(self):
+        self.assert_matches_reference([(type('Handler{}'.format(i), (), {}), url) for i, url in enumerate(ROUTES)])
+
+    def test_shared_handlers(self):
+        handlers = [type('Handler{}'.format(i), (), {}) for i in range(3)]
+        self.assert_matches_reference([(handlers[i % 3], url) for i, url in enumerate(ROUTES)])
+
+    def test_random_routes(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            urls = rng.sample(ROUTES, rng.randint(2, len(ROUTES)))
+            self.assert_matches_reference([(type('Handler{}'.format(i), (), {}), url) for i, url in enumerate(urls)])
+
+    def test_anchored_host(self):
+        handler = type('Handler', (), {})
+        url_class = Regex()
+        url_class.add_route(handler, (r'^api\.example\.com$', '/items/.*'))
+
+        self.assertEqual(url_class.find('api.example.com', 'items/x'), [(handler, {})])
+
+    def test_host_pattern_without_host(self):
+        handler = type('Handler', (), {})
+        url_class = Regex()
+        url_class.add_route(handler, ('.*', '/a/.*'))
+
+        self.assertEqual(url_class.find('', 'a/x'), [])
+        self.assertEqual(url_class.find(None, 'a/x'), [])
+
+
+# Trie routes of every kind: literal, '<type:name>' and '<name>' arguments, trailing '*', per host, and types whose
+# conversion can fail.
+TRIE_ROUTES = [
+    '/',
+    '/items',
+    '/items/<int:id>',
+    '/items/<id>',
+    '/items/new',
+    '/items/*',
+    '/*',
+    '/a/<str:x>/b',
+    '/a/*',
+    '/f/<float:value>',
+    ('api.example.com', '/items/<int:id>'),
+    ('api.example.com', '/*'),
+    ('www.example.com', '/a/<x>/b'),
+    ('www.example.com', '/'),
+]
+
+TRIE_HOSTS = [None, 'api.example.com', 'www.example.com', 'example.org']
+TRIE_PATHS = [None, '', '/', 'items', 'items/', '/items/1/', 'items/1', 'items/new', 'items/x', 'items/1/2', 'a',
+              'a/z', 'a/z/b', 'a/z/b/c', 'f/1.5', 'f/x', 'b']
+
+
+def reference_trie_find(routes, host, path):
+    """Matches every route in turn, the way Trie.find is documented to."""
+    segments = path.strip('/').split('/') if path else ['']
+
+    handlers = []
+    for cls, url in routes:
+        route_host, url = url if isinstance(url, tuple) else (None, url)
+        if route_host is not None and route_host != host:
+            continue
+
+        parts = url.strip('/').split('/')
+        if parts[-1] == '*':
+            parts = parts[:-1]
+            # At least one (non-empty) segment must be left for the '*'.
+            if len(segments) <= len(parts) or not segments[len(parts)]:
+                continue
+        elif len(segments) != len(parts):
+            continue
+
+        args = {}
+        for part, segment in zip(parts, segments):
+            if part.startswith('<'):
+                type, _, name = part[1:-1].rpartition(':')
+                if not segment:
+                    break
+                try:
+                    args[name] = getattr(builtins, type or 'str')(segment)
+                except ValueError:
+                    break
+            elif part != segment:
+                break
+        else:
+            if not any(cls is found for found, _ in handlers):
+                handlers.append((cls, args))
+
+    return handlers
+
+
+class TrieFindTest(unittest.TestCase):
+    def assert_matches_reference(self, routes):
+        url_class = Trie()
+        for cls, url in routes:
+            url_class.add_route(cls, url)
+
+        for host in TRIE_HOSTS:
+            for path in TRIE_PATHS:
+                with self.subTest(routes=[url for _, url in routes], host=host, path=path):
+                    self.assertEqual(url_class.find(host, path), reference_trie_find(routes, host, path))
+
+    def test_each_route(self):
+        for url in TRIE_ROUTES:
+            self.assert_matches_reference([(type('Handler', (), {}), url)])
+
+    def test_all_routes(self):
+        self.assert_matches_reference([(type('Handler{}'.format(i), (), {}), url) for i, url in enumerate(TRIE_ROUTES)])
+
+    def test_shared_handlers(self):
+        handlers = [type('Handler{}'.format(i), (), {}) for i in range(3)]
+        self.assert_matches_reference([(handlers[i % 3], url) for i, url in enumerate(TRIE_ROUTES)])
+
+    def test_random_routes(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            urls = rng.sample(TRIE_ROUTES, rng.randint(2, len(TRIE_ROUTES)))
+            self.assert_matches_reference([(type('Handler{}'.format(i), (), {}), url) for i, url in enumerate(urls)])
+
+    def test_failed_conversion_is_no_match(self):
+        handler = type('Handler', (), {})
+        url_class = Trie()
+        url_class.add_route(handler, '/u/<int:id>')
+
+        self.assertEqual(url_class.find(None, 'u/bob'), [])
+        self.assertEqual(url_class.find(None, 'u/7'), [(handler, {'id': 7})])
+
+    def test_wildcard_needs_a_segment(self):
+        handler = type('Handler', (), {})
+        url_class = Trie()
+        url_class.add_route(handler, '/*')
+
+        self.assertEqual(url_class.find(None, ''), [])
+        self.assertEqual(url_class.find(None, 'x/y'), [(handler, {})])
+
+    def test_handlers_deduplicated_by_identity(self):
+        class Equal(type):
+            def __eq__(cls, other):
+                return isinstance(other, Equal)
+
+            def __hash__(cls):
+                return 0
+
+        first = Equal('First', (), {})
+        second = Equal('Second', (), {})
+        url_class = Trie()
+        url_class.add_route(first, '/a')
+        url_class.add_route(second, '/a')
+        url_class.add_route(first, '/*')
+
+        self.assertEqual([cls for cls, _ in url_class.find(None, 'a')], [first, second])
+
+    def test_invalid_routes(self):
+        url_class = Trie()
+        for url in ('/products/id-<int:id>', '/a/<int:id>>', '/*/a', 'no-slash', ('host', 1)):
+            with self.subTest(url=url):
+                with self.assertRaises(ValueError):
+                    url_class.add_route(object, url)
+
+        with self.assertRaises(AttributeError):
+            url_class.add_route(object, '/<nosuchtype:id>')
+
+
+if __name__ == '__main__':
+    unittest.main()